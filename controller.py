@@ -4,11 +4,31 @@ Simple Mini Kinta DMX Controller
 Works on all platforms - menu-driven interface
 """
 
-import serial
 import time
-import threading
 
-PORT = "/dev/cu.usbserial-AQ02YN7D"
+# Taken before the imports below, so their cost is part of the startup time
+STARTED = time.perf_counter()
+
+import os  # noqa: E402
+import threading  # noqa: E402
+
+from port_discovery import connect, write_dmx  # noqa: E402
+
+def launch_elapsed():
+    """
+    Returns (milliseconds, since what) for the startup time.
+    On Linux this is since the process started (10ms resolution),
+    elsewhere since this module started loading, which leaves out
+    interpreter startup.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return (uptime - start_ticks / os.sysconf("SC_CLK_TCK")) * 1000, "launch"
+    except (OSError, ValueError, IndexError):
+        return (time.perf_counter() - STARTED) * 1000, "controller import"
 
 class MiniKintaController:
     def __init__(self):
@@ -17,26 +37,13 @@ class MiniKintaController:
         self.strobe = 0
         self.motor = 0
         
-        # Connect to DMX interface
-        self.ser = serial.Serial(
-            port=PORT,
-            baudrate=250000,
-            bytesize=8,
-            parity=serial.PARITY_NONE,
-            stopbits=2,
-            timeout=1
-        )
-        print(f"✓ Connected to DMX interface: {PORT}")
+        # Connect to DMX interface (cached port first, rescan if it went stale)
+        self.ser, self.kind = connect()
+        print(f"✓ Connected to DMX interface: {self.ser.port} ({self.kind})")
         
     def send_dmx_frame(self):
-        """Send a single DMX frame"""
+        """Send a single DMX frame, returns True if it went out"""
         try:
-            # DMX Break
-            self.ser.break_condition = True
-            time.sleep(0.0001)
-            self.ser.break_condition = False
-            time.sleep(0.00001)
-            
             # Create DMX packet
             dmx_data = [0] * 513
             dmx_data[0] = 0           # Start code
@@ -44,10 +51,12 @@ class MiniKintaController:
             dmx_data[2] = self.strobe # Channel 2: Strobe
             dmx_data[3] = self.motor  # Channel 3: Motor
             
-            self.ser.write(bytes(dmx_data))
+            write_dmx(self.ser, self.kind, dmx_data)
+            return True
             
         except Exception as e:
             print(f"DMX send error: {e}")
+            return False
     
     def dmx_thread(self):
         """Continuous DMX transmission thread"""
@@ -59,6 +68,11 @@ class MiniKintaController:
         """Start the DMX controller"""
         self.running = True
         
+        # First frame goes out right away so startup time can be measured
+        if self.send_dmx_frame():
+            elapsed_ms, since = launch_elapsed()
+            print(f"⏱️  First DMX frame sent {elapsed_ms:.0f} ms after {since}")
+        
         # Start DMX transmission thread
         dmx_thread = threading.Thread(target=self.dmx_thread, daemon=True)
         dmx_thread.start()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+USB-DMX port autodiscovery
+Finds the DMX interface without a hardcoded port and remembers it for next launch
+"""
+
+import json
+import os
+import threading
+import time
+
+import serial
+from serial.tools import list_ports
+
+CACHE_FILE = os.path.expanduser("~/.mini_kinta_port.json")
+PORT_ENV = "MINI_KINTA_PORT"  # set to a port to skip autodiscovery
+PROBE_TIMEOUT = 0.2  # seconds per port read/write
+SCAN_TIMEOUT = 0.5   # seconds for the whole scan, hung ports are given up on
+
+# USB-DMX interfaces (Open DMX style and Enttec Pro style) use FTDI chips
+FTDI_VID = 0x0403
+
+# Widget protocol (Enttec DMX USB Pro and compatibles)
+WIDGET_START = 0x7E
+WIDGET_END = 0xE7
+LABEL_GET_PARAMS = 3
+LABEL_SEND_DMX = 6
+
+
+class DMXPortNotFound(Exception):
+    """No USB-DMX interface could be found"""
+
+
+def widget_message(label, data=b""):
+    """Build a widget protocol message"""
+    return bytes([WIDGET_START, label, len(data) & 0xFF, len(data) >> 8]) + bytes(data) + bytes([WIDGET_END])
+
+
+def open_dmx_port(port, timeout=1):
+    """Open a serial port with DMX512 settings"""
+    return serial.Serial(
+        port=port,
+        baudrate=250000,
+        bytesize=8,
+        parity=serial.PARITY_NONE,
+        stopbits=2,
+        timeout=timeout,
+        write_timeout=timeout
+    )
+
+
+def write_dmx(ser, kind, dmx_data, break_time=0.0001, mab_time=0.00001):
+    """
+    Send one DMX frame (start code + channels).
+    Widget interfaces generate break and timing themselves, open
+    interfaces get the break and mark-after-break from us.
+    """
+    if kind == "widget":
+        ser.write(widget_message(LABEL_SEND_DMX, dmx_data))
+        return
+
+    # DMX Break
+    ser.break_condition = True
+    time.sleep(break_time)
+    ser.break_condition = False
+
+    # Mark After Break
+    time.sleep(mab_time)
+
+    ser.write(bytes(dmx_data))
+
+
+def candidate_ports():
+    """
+    List FTDI serial devices, the only ones that can be a USB-DMX interface.
+    Returns {port: serial_number} in port order.
+    """
+    ports = [p for p in list_ports.comports() if p.vid == FTDI_VID]
+    return {p.device: p.serial_number for p in sorted(ports, key=lambda p: p.device)}
+
+
+def probe_port(port, timeout=PROBE_TIMEOUT):
+    """
+    Check a single FTDI port.
+    Returns "widget" if it answers the widget handshake, "open" if it is
+    silent (plain FTDI Open DMX style interface), or None if unusable.
+    """
+    try:
+        ser = open_dmx_port(port, timeout=timeout)
+    except Exception:
+        return None
+
+    try:
+        ser.reset_input_buffer()
+        # Request widget parameters (user config size 0)
+        ser.write(widget_message(LABEL_GET_PARAMS, b"\x00\x00"))
+        reply = ser.read(4)
+        if len(reply) == 4 and reply[0] == WIDGET_START and reply[1] == LABEL_GET_PARAMS:
+            return "widget"
+        return "open"
+    except Exception:
+        return None
+    finally:
+        ser.close()
+
+
+def scan_ports(ports, timeout=PROBE_TIMEOUT, deadline=SCAN_TIMEOUT):
+    """Probe ports in parallel, returns {port: kind} for the usable ones"""
+    results = {}
+
+    def probe(port):
+        results[port] = probe_port(port, timeout)
+
+    # Daemon threads, so a port that hangs on open can't hold up startup or exit
+    threads = [threading.Thread(target=probe, args=(port,), daemon=True) for port in ports]
+    for thread in threads:
+        thread.start()
+
+    end = time.monotonic() + deadline
+    for thread in threads:
+        thread.join(max(0, end - time.monotonic()))
+
+    return {port: results[port] for port in ports if results.get(port)}
+
+
+def load_cached_port():
+    """Return the cached (port, kind, serial_number), or None"""
+    try:
+        with open(CACHE_FILE) as f:
+            cached = json.load(f)
+        return cached["port"], cached["kind"], cached["serial_number"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_cached_port(port, kind, serial_number):
+    """Remember the discovered port for the next launch"""
+    try:
+        with open(CACHE_FILE, "w") as f:
+            json.dump({"port": port, "kind": kind, "serial_number": serial_number}, f)
+    except OSError as e:
+        print(f"⚠️  Could not cache DMX port: {e}")
+
+
+def forget_cached_port():
+    """Drop the cached port, forcing a rescan on next lookup"""
+    try:
+        os.remove(CACHE_FILE)
+    except OSError:
+        pass
+
+
+def report_scan(ports, found):
+    """Print how each candidate port was classified"""
+    if not ports:
+        print("  No FTDI serial devices found")
+    for port, serial_number in ports.items():
+        kind = found.get(port) or f"unusable or no answer within {SCAN_TIMEOUT}s"
+        print(f"  {port} (serial {serial_number}): {kind}")
+
+
+def override_port(port, use_cache=True):
+    """
+    Use a port chosen by the user, returns (port, kind).
+    The kind comes from the cache if it is for the same port, otherwise
+    only this port is probed.
+    """
+    cached = load_cached_port() if use_cache else None
+    if cached and cached[0] == port:
+        return port, cached[1]
+
+    kind = probe_port(port)
+    if not kind:
+        raise DMXPortNotFound(f"{port} could not be opened, check {PORT_ENV}")
+    save_cached_port(port, kind, candidate_ports().get(port))
+    return port, kind
+
+
+def find_port(use_cache=True, port=None):
+    """
+    Find the DMX interface.
+    Returns (port, kind) where kind is "widget" or "open".
+    A port passed in or set in MINI_KINTA_PORT is used without scanning.
+    The cached port is only used if the same adapter is still on it.
+    """
+    port = port or os.environ.get(PORT_ENV)
+    if port:
+        return override_port(port, use_cache)
+
+    ports = candidate_ports()
+
+    cached = load_cached_port() if use_cache else None
+    if cached:
+        port, kind, serial_number = cached
+        # Open interfaces can't be identified without a slow probe, the
+        # adapter's serial number has to do. Widgets answer straight away.
+        if ports.get(port, "") == serial_number and (kind != "widget" or probe_port(port) == "widget"):
+            return port, kind
+        forget_cached_port()
+
+    print("Scanning for USB-DMX interfaces...")
+    found = scan_ports(list(ports))
+    report_scan(ports, found)
+    if not found:
+        raise DMXPortNotFound("No USB-DMX interface found. Is it plugged in?")
+
+    # Prefer interfaces that answered the widget handshake (min is stable,
+    # so ties keep port order)
+    port = min(found, key=lambda p: found[p] != "widget")
+    kind = found[port]
+    if kind == "widget":
+        print(f"→ Using {port}: answered the widget handshake")
+    else:
+        print(f"→ Using {port}: first open interface, set {PORT_ENV} to choose another")
+
+    save_cached_port(port, kind, ports[port])
+    return port, kind
+
+
+def connect(use_cache=True, port=None):
+    """
+    Find and open the DMX interface, returns (ser, kind).
+    If the cached port won't open, it is forgotten and the ports rescanned.
+    """
+    chosen = port or os.environ.get(PORT_ENV)
+    port, kind = find_port(use_cache, chosen)
+    try:
+        return open_dmx_port(port), kind
+    except serial.SerialException:
+        # A port the user chose is not second-guessed
+        if not use_cache or chosen:
+            raise
+        forget_cached_port()
+        port, kind = find_port(use_cache=False)
+        return open_dmx_port(port), kind
+
+
+if __name__ == "__main__":
+    print("Scanning for USB-DMX interfaces...")
+    ports = candidate_ports()
+    report_scan(ports, scan_ports(list(ports)))
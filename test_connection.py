@@ -6,7 +6,10 @@ Mini Kinta specific DMX test based on manual specifications
 import serial
 import time
 
-PORT = "/dev/cu.usbserial-AQ02YN7D"
+from port_discovery import DMXPortNotFound, connect, open_dmx_port, write_dmx
+
+PORT = None  # found at startup by port_discovery
+KIND = None  # "widget" or "open"
 
 def mini_kinta_dmx_test():
     """Test with Mini Kinta's exact DMX specifications"""
@@ -21,14 +24,7 @@ def mini_kinta_dmx_test():
     input()
     
     try:
-        ser = serial.Serial(
-            port=PORT,
-            baudrate=250000,
-            bytesize=8,
-            parity=serial.PARITY_NONE,
-            stopbits=2,
-            timeout=1
-        )
+        ser = open_dmx_port(PORT)
         
         print("\nSending DMX data...")
         
@@ -61,14 +57,6 @@ def mini_kinta_dmx_test():
             frame_count = 0
             
             while time.time() - start_time < 5:
-                # DMX Break (minimum 88 microseconds)
-                ser.break_condition = True
-                time.sleep(0.0001)  # 100 microseconds
-                ser.break_condition = False
-                
-                # Mark After Break (minimum 8 microseconds)
-                time.sleep(0.00001)  # 10 microseconds
-                
                 # DMX packet: start code + 512 channels
                 dmx_data = [0] * 513
                 dmx_data[0] = 0      # Start code
@@ -76,7 +64,8 @@ def mini_kinta_dmx_test():
                 dmx_data[2] = strobe # Channel 2
                 dmx_data[3] = motor  # Channel 3
                 
-                ser.write(bytes(dmx_data))
+                # Break 100us (minimum 88), Mark After Break 10us (minimum 8)
+                write_dmx(ser, KIND, dmx_data, break_time=0.0001, mab_time=0.00001)
                 frame_count += 1
                 
                 # Standard DMX refresh rate (44Hz)
@@ -96,13 +85,7 @@ def mini_kinta_dmx_test():
         # Final cleanup
         print("\nSending final OFF command...")
         for _ in range(10):
-            ser.break_condition = True
-            time.sleep(0.0001)
-            ser.break_condition = False
-            time.sleep(0.00001)
-            
-            dmx_data = [0] * 513
-            ser.write(bytes(dmx_data))
+            write_dmx(ser, KIND, [0] * 513)
             time.sleep(0.023)
         
         ser.close()
@@ -134,14 +117,7 @@ def test_extreme_values():
     print("\nTesting with extreme values...")
     
     try:
-        ser = serial.Serial(
-            port=PORT,
-            baudrate=250000,
-            bytesize=8,
-            parity=serial.PARITY_NONE,
-            stopbits=2,
-            timeout=1
-        )
+        ser = open_dmx_port(PORT)
         
         # Send maximum values for 10 seconds
         print("Sending MAXIMUM values (all channels at 255)...")
@@ -149,25 +125,14 @@ def test_extreme_values():
         
         start_time = time.time()
         while time.time() - start_time < 10:
-            ser.break_condition = True
-            time.sleep(0.0001)
-            ser.break_condition = False
-            time.sleep(0.00001)
-            
             dmx_data = [0] + [255] * 512  # All channels max
-            ser.write(bytes(dmx_data))
+            write_dmx(ser, KIND, dmx_data)
             time.sleep(0.023)
         
         # Turn everything off
         print("Turning everything OFF...")
         for _ in range(10):
-            ser.break_condition = True
-            time.sleep(0.0001)
-            ser.break_condition = False
-            time.sleep(0.00001)
-            
-            dmx_data = [0] * 513
-            ser.write(bytes(dmx_data))
+            write_dmx(ser, KIND, [0] * 513)
             time.sleep(0.023)
         
         ser.close()
@@ -176,6 +141,17 @@ def test_extreme_values():
         print(f"Error: {e}")
 
 if __name__ == "__main__":
+    try:
+        # connect() rescans if the cached port won't open
+        ser, KIND = connect()
+        PORT = ser.port
+        ser.close()
+    except (DMXPortNotFound, serial.SerialException) as e:
+        print(f"✗ {e}")
+        print("Check the USB cable, then run: python3 port_discovery.py")
+        print("or set MINI_KINTA_PORT to the interface's port")
+        raise SystemExit(1)
+    print(f"Using DMX interface: {PORT} ({KIND})")
     mini_kinta_dmx_test()
     check_dmx_cable()
     
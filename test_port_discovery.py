@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Hardware-free checks for port discovery and controller startup
+Run with: python3 -m pytest test_port_discovery.py
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+
+import pytest
+
+import controller
+import port_discovery
+
+
+class FakeSerial:
+    """Stands in for an open serial port, records what was sent"""
+
+    def __init__(self, port="/dev/ttyUSB0"):
+        self.port = port
+        self.break_condition = False
+        self.breaks = 0
+        self.written = []
+
+    def __setattr__(self, name, value):
+        if name == "break_condition" and value:
+            self.breaks += 1
+        super().__setattr__(name, value)
+
+    def write(self, data):
+        self.written.append(bytes(data))
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def cache_file(tmp_path, monkeypatch):
+    path = tmp_path / "port.json"
+    monkeypatch.setattr(port_discovery, "CACHE_FILE", str(path))
+    monkeypatch.delenv(port_discovery.PORT_ENV, raising=False)
+    return path
+
+
+def fake_adapters(monkeypatch, adapters):
+    """adapters: {port: (serial_number, kind)}, returns the list of probed ports"""
+    probed = []
+
+    def probe_port(port, timeout=port_discovery.PROBE_TIMEOUT):
+        probed.append(port)
+        return adapters[port][1]
+
+    monkeypatch.setattr(port_discovery, "candidate_ports",
+                        lambda: {port: sn for port, (sn, _) in adapters.items()})
+    monkeypatch.setattr(port_discovery, "probe_port", probe_port)
+    return probed
+
+
+def test_widget_message_framing():
+    assert port_discovery.widget_message(3, b"\x00\x00") == bytes([0x7E, 3, 2, 0, 0, 0, 0xE7])
+
+    message = port_discovery.widget_message(6, [0] * 513)
+    assert message[:4] == bytes([0x7E, 6, 0x01, 0x02])  # 513 = 0x0201
+    assert len(message) == 4 + 513 + 1
+    assert message[-1] == 0xE7
+
+
+def test_write_dmx_open_sends_break_and_raw_frame():
+    ser = FakeSerial()
+    port_discovery.write_dmx(ser, "open", [0, 20, 0, 0])
+    assert ser.breaks == 1
+    assert ser.written == [bytes([0, 20, 0, 0])]
+
+
+def test_write_dmx_widget_wraps_frame():
+    ser = FakeSerial()
+    port_discovery.write_dmx(ser, "widget", [0, 20, 0, 0])
+    assert ser.breaks == 0
+    assert ser.written == [port_discovery.widget_message(6, [0, 20, 0, 0])]
+
+
+def test_find_port_prefers_widget(monkeypatch):
+    fake_adapters(monkeypatch, {
+        "/dev/ttyUSB0": ("A1", "open"),
+        "/dev/ttyUSB1": ("B2", "widget"),
+        "/dev/ttyUSB2": ("C3", None),
+    })
+    assert port_discovery.find_port() == ("/dev/ttyUSB1", "widget")
+    assert port_discovery.load_cached_port() == ("/dev/ttyUSB1", "widget", "B2")
+
+
+def test_find_port_falls_back_to_open_in_port_order(monkeypatch):
+    fake_adapters(monkeypatch, {
+        "/dev/ttyUSB0": ("A1", None),
+        "/dev/ttyUSB1": ("B2", "open"),
+        "/dev/ttyUSB2": ("C3", "open"),
+    })
+    assert port_discovery.find_port() == ("/dev/ttyUSB1", "open")
+
+
+def test_find_port_not_found(monkeypatch):
+    fake_adapters(monkeypatch, {"/dev/ttyUSB0": ("A1", None)})
+    with pytest.raises(port_discovery.DMXPortNotFound):
+        port_discovery.find_port()
+
+
+def test_cached_open_port_used_without_probing(monkeypatch):
+    probed = fake_adapters(monkeypatch, {
+        "/dev/ttyUSB0": ("A1", "open"),
+        "/dev/ttyUSB1": ("B2", "widget"),
+    })
+    port_discovery.save_cached_port("/dev/ttyUSB0", "open", "A1")
+    assert port_discovery.find_port() == ("/dev/ttyUSB0", "open")
+    assert probed == []
+
+
+def test_cached_widget_port_is_verified(monkeypatch):
+    probed = fake_adapters(monkeypatch, {"/dev/ttyUSB0": ("A1", "widget")})
+    port_discovery.save_cached_port("/dev/ttyUSB0", "widget", "A1")
+    assert port_discovery.find_port() == ("/dev/ttyUSB0", "widget")
+    assert probed == ["/dev/ttyUSB0"]
+
+
+def test_cached_port_with_other_adapter_is_rescanned(monkeypatch):
+    fake_adapters(monkeypatch, {
+        "/dev/ttyUSB0": ("ZZ", "open"),
+        "/dev/ttyUSB1": ("A1", "open"),
+    })
+    port_discovery.save_cached_port("/dev/ttyUSB0", "open", "A1")
+    assert port_discovery.find_port() == ("/dev/ttyUSB0", "open")
+    assert port_discovery.load_cached_port() == ("/dev/ttyUSB0", "open", "ZZ")
+
+
+def test_cached_port_gone_is_rescanned(monkeypatch):
+    fake_adapters(monkeypatch, {"/dev/ttyUSB1": ("B2", "open")})
+    port_discovery.save_cached_port("/dev/ttyUSB0", "open", "A1")
+    assert port_discovery.find_port() == ("/dev/ttyUSB1", "open")
+    assert port_discovery.load_cached_port() == ("/dev/ttyUSB1", "open", "B2")
+
+
+def test_cache_forget_and_corrupt(cache_file):
+    port_discovery.save_cached_port("/dev/ttyUSB0", "open", "A1")
+    port_discovery.forget_cached_port()
+    assert port_discovery.load_cached_port() is None
+    port_discovery.forget_cached_port()  # already gone is fine
+
+    cache_file.write_text("not json")
+    assert port_discovery.load_cached_port() is None
+
+
+def test_connect_rescans_when_cached_port_wont_open(monkeypatch):
+    # Cache still matches, but the device can't be opened any more
+    fake_adapters(monkeypatch, {
+        "/dev/ttyUSB0": ("A1", None),
+        "/dev/ttyUSB1": ("B2", "open"),
+    })
+    port_discovery.save_cached_port("/dev/ttyUSB0", "open", "A1")
+
+    def open_dmx_port(port, timeout=1):
+        if port == "/dev/ttyUSB0":
+            raise port_discovery.serial.SerialException("busy")
+        return FakeSerial(port)
+
+    monkeypatch.setattr(port_discovery, "open_dmx_port", open_dmx_port)
+
+    ser, kind = port_discovery.connect()
+    assert (ser.port, kind) == ("/dev/ttyUSB1", "open")
+
+
+def test_scan_gives_up_on_hung_ports(monkeypatch):
+    def probe_port(port, timeout):
+        if port == "/dev/ttyUSB0":
+            time.sleep(5)  # hangs on open
+        return "open"
+
+    monkeypatch.setattr(port_discovery, "probe_port", probe_port)
+
+    start = time.perf_counter()
+    found = port_discovery.scan_ports(["/dev/ttyUSB0", "/dev/ttyUSB1"], deadline=0.1)
+    assert time.perf_counter() - start < 0.5
+    assert found == {"/dev/ttyUSB1": "open"}
+
+
+def test_find_port_reports_choice(monkeypatch, capsys):
+    fake_adapters(monkeypatch, {
+        "/dev/ttyUSB0": ("A1", None),
+        "/dev/ttyUSB1": ("B2", "open"),
+    })
+    port_discovery.find_port()
+    out = capsys.readouterr().out
+    assert "/dev/ttyUSB0 (serial A1): unusable" in out
+    assert "/dev/ttyUSB1 (serial B2): open" in out
+    assert "Using /dev/ttyUSB1" in out
+
+
+def test_env_override_skips_scan(monkeypatch):
+    probed = fake_adapters(monkeypatch, {
+        "/dev/ttyUSB0": ("A1", "widget"),
+        "/dev/ttyUSB1": ("B2", "open"),
+    })
+    monkeypatch.setenv(port_discovery.PORT_ENV, "/dev/ttyUSB1")
+    assert port_discovery.find_port() == ("/dev/ttyUSB1", "open")
+    assert probed == ["/dev/ttyUSB1"]
+
+    # Next launch takes the kind from the cache, nothing is probed
+    del probed[:]
+    assert port_discovery.find_port() == ("/dev/ttyUSB1", "open")
+    assert probed == []
+
+
+def test_port_argument_overrides_cache(monkeypatch):
+    fake_adapters(monkeypatch, {
+        "/dev/ttyUSB0": ("A1", "open"),
+        "/dev/ttyUSB1": ("B2", "open"),
+    })
+    port_discovery.save_cached_port("/dev/ttyUSB0", "open", "A1")
+    assert port_discovery.find_port(port="/dev/ttyUSB1") == ("/dev/ttyUSB1", "open")
+
+
+def test_override_that_wont_open(monkeypatch):
+    fake_adapters(monkeypatch, {"/dev/ttyUSB0": ("A1", None), "/dev/ttyUSB1": ("B2", "open")})
+    monkeypatch.setenv(port_discovery.PORT_ENV, "/dev/ttyUSB0")
+    with pytest.raises(port_discovery.DMXPortNotFound):
+        port_discovery.find_port()
+
+
+def test_connect_does_not_rescan_chosen_port(monkeypatch):
+    fake_adapters(monkeypatch, {"/dev/ttyUSB0": ("A1", "open"), "/dev/ttyUSB1": ("B2", "open")})
+    port_discovery.save_cached_port("/dev/ttyUSB0", "open", "A1")
+    monkeypatch.setenv(port_discovery.PORT_ENV, "/dev/ttyUSB0")
+
+    def open_dmx_port(port, timeout=1):
+        raise port_discovery.serial.SerialException("busy")
+
+    monkeypatch.setattr(port_discovery, "open_dmx_port", open_dmx_port)
+    with pytest.raises(port_discovery.serial.SerialException):
+        port_discovery.connect()
+
+
+def test_controller_import_time():
+    # Measured in a fresh interpreter, the bound is generous to avoid flakiness
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import controller"],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    match = re.search(r"\|\s*(\d+) \| controller$", result.stderr, re.M)
+    assert match, result.stderr
+    assert int(match.group(1)) < 100_000  # microseconds
+
+
+def test_send_dmx_frame_reports_failure():
+    kinta = controller.MiniKintaController.__new__(controller.MiniKintaController)
+    kinta.color = kinta.strobe = kinta.motor = 0
+    kinta.kind = "open"
+    kinta.ser = None  # write fails
+    assert kinta.send_dmx_frame() is False
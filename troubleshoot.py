@@ -6,20 +6,16 @@ DMX Debug Tool - Test communication with USB-DMX interface
 import serial
 import time
 
-PORT = "/dev/cu.usbserial-AQ02YN7D"
+from port_discovery import DMXPortNotFound, candidate_ports, connect, open_dmx_port, write_dmx
+
+PORT = None  # found at startup by port_discovery
+KIND = None  # "widget" or "open"
 
 def test_serial_connection():
     """Test basic serial connection"""
     try:
         print("Testing serial connection...")
-        ser = serial.Serial(
-            port=PORT,
-            baudrate=250000,
-            bytesize=8,
-            parity=serial.PARITY_NONE,
-            stopbits=2,
-            timeout=1
-        )
+        ser = open_dmx_port(PORT)
         print(f"✓ Connected to {PORT}")
         print(f"  Baudrate: {ser.baudrate}")
         print(f"  Bytesize: {ser.bytesize}")
@@ -42,26 +38,11 @@ def test_dmx_with_break():
     """Test DMX with proper break and MAB"""
     try:
         print("\nTesting DMX with proper timing...")
-        ser = serial.Serial(
-            port=PORT,
-            baudrate=250000,
-            bytesize=8,
-            parity=serial.PARITY_NONE,
-            stopbits=2,
-            timeout=1
-        )
+        ser = open_dmx_port(PORT)
         
         for test_num in range(3):
             print(f"DMX Test {test_num + 1}...")
             
-            # Send BREAK (low for 100+ microseconds)
-            ser.break_condition = True
-            time.sleep(0.0002)  # 200 microseconds
-            ser.break_condition = False
-            
-            # Mark After Break (high for 12+ microseconds)
-            time.sleep(0.00002)  # 20 microseconds
-            
             # Create DMX packet
             dmx_data = [0] * 513  # Start code + 512 channels
             dmx_data[0] = 0       # Start code
@@ -69,22 +50,15 @@ def test_dmx_with_break():
             dmx_data[2] = 255 if test_num == 1 else 0    # Channel 2 - strobe
             dmx_data[3] = 255 if test_num == 2 else 127  # Channel 3 - motor
             
-            # Send packet
-            packet = bytes(dmx_data)
-            ser.write(packet)
+            # Send packet with BREAK 200us (100+) and Mark After Break 20us (12+)
+            write_dmx(ser, KIND, dmx_data, break_time=0.0002, mab_time=0.00002)
             
             print(f"  Sent: Ch1={dmx_data[1]}, Ch2={dmx_data[2]}, Ch3={dmx_data[3]}")
             time.sleep(2)
         
         # Turn everything off
         print("Turning off...")
-        ser.break_condition = True
-        time.sleep(0.0002)
-        ser.break_condition = False
-        time.sleep(0.00002)
-        
-        dmx_data = [0] * 513
-        ser.write(bytes(dmx_data))
+        write_dmx(ser, KIND, [0] * 513, break_time=0.0002, mab_time=0.00002)
         
         ser.close()
         print("✓ DMX test complete")
@@ -97,12 +71,17 @@ def test_different_baudrates():
     baudrates = [9600, 38400, 57600, 115200, 250000]
     
     print("\nTesting different baud rates...")
+    if KIND == "widget":
+        print("- Skipped: widget interfaces ignore the serial baud rate")
+        return
+    
     for baud in baudrates:
         try:
             ser = serial.Serial(
                 port=PORT,
                 baudrate=baud,
-                timeout=1
+                timeout=1,
+                write_timeout=1
             )
             ser.write(b"test")
             ser.close()
@@ -116,23 +95,10 @@ def test_continuous_dmx():
         print("\nStarting continuous DMX stream...")
         print("Press Ctrl+C to stop")
         
-        ser = serial.Serial(
-            port=PORT,
-            baudrate=250000,
-            bytesize=8,
-            parity=serial.PARITY_NONE,
-            stopbits=2,
-            timeout=1
-        )
+        ser = open_dmx_port(PORT)
         
         frame_count = 0
         while True:
-            # DMX Break
-            ser.break_condition = True
-            time.sleep(0.0001)  # 100 microseconds
-            ser.break_condition = False
-            time.sleep(0.00001)  # 10 microseconds
-            
             # Create packet
             dmx_data = [0] * 513
             
@@ -147,7 +113,7 @@ def test_continuous_dmx():
             
             dmx_data[3] = 100  # Motor speed
             
-            ser.write(bytes(dmx_data))
+            write_dmx(ser, KIND, dmx_data)
             
             frame_count += 1
             if frame_count % 100 == 0:
@@ -158,16 +124,39 @@ def test_continuous_dmx():
     except KeyboardInterrupt:
         print("\nStopping continuous DMX...")
         # Send all zeros
-        dmx_data = [0] * 513
-        ser.write(bytes(dmx_data))
+        write_dmx(ser, KIND, [0] * 513)
         ser.close()
     except Exception as e:
         print(f"✗ Continuous DMX failed: {e}")
 
+def find_interface():
+    """Find the DMX interface, returns True if one was found"""
+    global PORT, KIND
+    
+    print("Looking for USB-DMX interface...")
+    print(f"  FTDI serial devices: {', '.join(candidate_ports()) or 'none'}")
+    try:
+        # connect() rescans if the cached port won't open
+        ser, KIND = connect()
+        PORT = ser.port
+        ser.close()
+    except (DMXPortNotFound, serial.SerialException) as e:
+        print(f"✗ {e}")
+        print("  Check the USB cable and that the FTDI driver is installed,")
+        print("  or set MINI_KINTA_PORT to the interface's port")
+        return False
+    
+    print(f"✓ Found {PORT} ({KIND})")
+    return True
+
 def main():
     print("DMX Debug Tool")
     print("=" * 40)
     
+    # Test 0: Find the interface
+    if not find_interface():
+        return
+    
     # Test 1: Basic serial connection
     if not test_serial_connection():
         return